@@ -9,6 +9,8 @@ class JsonSerializableMixin:
     Mixin to force subclasses to implement the json method
     """
 
+    __slots__ = ()
+
     @property
     @abc.abstractmethod
     def json(self):
@@ -21,16 +23,22 @@ class AbstractEItem(JsonSerializableMixin):
     For instance : {"term": {"field": {"value": "query"}}}
     """
 
-    boost = None
-    _fuzzy = None
+    # items are built for each term of the query, use slots to keep them light
+    __slots__ = (
+        '_method', '_fields', '_no_analyze', 'zero_terms_query', 'field_options', '_name',
+        'boost', '_fuzzy', '_added_keys')
 
     _KEYS_TO_ADD = ('boost', 'fuzziness', '_name')
     ADDITIONAL_KEYS_TO_ADD = ()
 
     def __init__(self, no_analyze=None, method='term', fields=[], _name=None, field_options=None):
+        self.boost = None
+        self._fuzzy = None
+        # keys to add specific to this instance
+        self._added_keys = ()
         self._method = method
         self._fields = fields
-        self._no_analyze = no_analyze if no_analyze else []
+        self._no_analyze = no_analyze if no_analyze else frozenset()
         self.zero_terms_query = 'none'
         self.field_options = field_options or {}
         if _name is not None:
@@ -39,28 +47,30 @@ class AbstractEItem(JsonSerializableMixin):
     @property
     def json(self):
         field = self.field
+        # method is computed (looking for wildcards), do it once
+        method = self.method
         inner_json = dict(self.field_options.get(field, {}))
         result = inner_json.pop('match_type', None)  # remove "match_type" key
         if not result:  # conditionally remove "type" (for backward compatibility)
             inner_json.pop('type', None)
-        if self.method in ['query_string', 'multi_match']:
-            json = {self.method: inner_json}
+        if method in ['query_string', 'multi_match']:
+            json = {method: inner_json}
         else:
-            json = {self.method: {field: inner_json}}
+            json = {method: {field: inner_json}}
 
         # add base conf
-        keys = self._KEYS_TO_ADD + self.ADDITIONAL_KEYS_TO_ADD
+        keys = self._KEYS_TO_ADD + self.ADDITIONAL_KEYS_TO_ADD + self._added_keys
         for key in keys:
             value = getattr(self, key, None)
             if value is not None:
                 if key == 'q':
-                    if 'match' in self.method:
+                    if 'match' in method:
                         inner_json['query'] = value
-                        if self.method == 'match':
+                        if method == 'match':
                             inner_json['zero_terms_query'] = self.zero_terms_query
-                    elif self.method == 'query_string':
+                    elif method == 'query_string':
                         inner_json['query'] = value
-                        inner_json['default_field'] = self.field
+                        inner_json['default_field'] = field
                         inner_json['analyze_wildcard'] = inner_json.get('analyze_wildcard', True)
                         inner_json['allow_leading_wildcard'] = inner_json.get(
                             'allow_leading_wildcard', True)
@@ -120,6 +130,9 @@ class EWord(AbstractEItem):
         ... )
     """
 
+    # slop is unused, but may be set by a proximity on a word
+    __slots__ = ('q', 'slop')
+
     ADDITIONAL_KEYS_TO_ADD = ('q', )
 
     def __init__(self, q, *args, **kwargs):
@@ -150,11 +163,13 @@ class EPhrase(AbstractEItem):
         ... )
     """
 
+    __slots__ = ('q', '_proximity')
+
     ADDITIONAL_KEYS_TO_ADD = ('q',)
-    _proximity = None
 
     def __init__(self, phrase, *args, **kwargs):
         super().__init__(method='match_phrase', *args, **kwargs)
+        self._proximity = None
         phrase = self._replace_CR_and_LF_by_a_whitespace(phrase)
         self.q = self._remove_double_quotes(phrase)
 
@@ -178,7 +193,7 @@ class EPhrase(AbstractEItem):
     @slop.setter
     def slop(self, slop):
         self._proximity = slop
-        self.ADDITIONAL_KEYS_TO_ADD += ('slop', )
+        self._added_keys += ('slop', )
 
 
 class ERange(AbstractEItem):
@@ -193,20 +208,22 @@ class ERange(AbstractEItem):
         ... )
     """
 
+    __slots__ = ('lt', 'lte', 'gt', 'gte')
+
     def __init__(self, lt=None, lte=None, gt=None, gte=None, *args, **kwargs):
         super().__init__(method='range', *args, **kwargs)
         if lt and lt != '*':
             self.lt = lt
-            self.ADDITIONAL_KEYS_TO_ADD += ('lt', )
+            self._added_keys += ('lt', )
         elif lte and lte != '*':
             self.lte = lte
-            self.ADDITIONAL_KEYS_TO_ADD += ('lte', )
+            self._added_keys += ('lte', )
         if gt and gt != '*':
             self.gt = gt
-            self.ADDITIONAL_KEYS_TO_ADD += ('gt', )
+            self._added_keys += ('gt', )
         elif gte and gte != '*':
             self.gte = gte
-            self.ADDITIONAL_KEYS_TO_ADD += ('gte', )
+            self._added_keys += ('gte', )
 
 
 class AbstractEOperation(JsonSerializableMixin):
@@ -278,23 +295,23 @@ class ENested(AbstractEOperation):
             ...     'ENested(a, EMust(EPhrase(text=François), EPhrase(text=Dupont)))'
             ... )
         """
-        if isinstance(subtree, ENested):
-            # Exclude ENested
-
-            if subtree.nested_path == self.nested_path:
-                return self._exclude_nested_children(subtree.items)
-            else:
-                return subtree
-        elif isinstance(subtree, AbstractEOperation):
-            # Exclude ENested in children
-            subtree.items = [
-                self._exclude_nested_children(child)
-                for child in subtree.items
-            ]
-            return subtree
-        else:
-            # return the subtree once ENested has been excluded
-            return subtree
+        subtree = self._unwrap_nested(subtree)
+        # walk operations with an explicit stack, to exclude ENested in their children
+        stack = [subtree]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, AbstractEOperation) and not isinstance(node, ENested):
+                node.items = [self._unwrap_nested(child) for child in node.items]
+                stack.extend(node.items)
+        # return the subtree once ENested has been excluded
+        return subtree
+
+    def _unwrap_nested(self, item):
+        """remove ENested on same path wrapping item
+        """
+        while isinstance(item, ENested) and item.nested_path == self.nested_path:
+            item = item.items
+        return item
 
     @property
     def json(self):
@@ -427,9 +444,8 @@ class ElasticSearchItemFactory:
     def build(self, cls, *args, **kwargs):
         # add parameters based on item type
         if issubclass(cls, AbstractEItem):
-            # eventually add field defaults to kwargs
-            if "field_options" not in kwargs:
-                kwargs = dict(kwargs, field_options=self._field_options)
+            # eventually add field defaults to kwargs (which is our own copy)
+            kwargs.setdefault("field_options", self._field_options)
             return cls(
                 no_analyze=self._no_analyze,
                 *args,
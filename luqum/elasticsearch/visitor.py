@@ -44,6 +44,10 @@ class ElasticsearchQueryBuilder(TreeVisitor):
     SHOULD = 'should'
     MUST = 'must'
 
+    # range bounds keys, depending on bound inclusion
+    RANGE_LOW_KEY = {True: 'gte', False: 'gt'}
+    RANGE_HIGH_KEY = {True: 'lte', False: 'lt'}
+
     CONTEXT_ANALYZE_MARKER = "analyzed"
     CONTEXT_FIELD_PREFIX = "field_prefix"
 
@@ -100,11 +104,10 @@ class ElasticsearchQueryBuilder(TreeVisitor):
             see :py:meth:`luqum.elasticsearch.schema.SchemaAnalyzer.query_builder_options`
 
         """
-        super().__init__(track_parents=True)
-        if not_analyzed_fields:
-            self._not_analyzed_fields = not_analyzed_fields
-        else:
-            self._not_analyzed_fields = []
+        # parents are not needed to build the query, do not track them
+        super().__init__(track_parents=False)
+        # a set, as items look up their field in it
+        self._not_analyzed_fields = frozenset(not_analyzed_fields or ())
 
         self.nested_fields = self._normalize_nested_fields(nested_fields)
         self._nested_prefixes = set(
@@ -138,8 +141,9 @@ class ElasticsearchQueryBuilder(TreeVisitor):
         return context.get(self.CONTEXT_FIELD_PREFIX, []) if context is not None else []
 
     def _fields(self, context):
-        default = [self.default_field]
-        return context.get(self.CONTEXT_FIELD_PREFIX, default) if context is not None else default
+        fields = context.get(self.CONTEXT_FIELD_PREFIX) if context is not None else None
+        # only build default fields when they are needed
+        return fields if fields is not None else [self.default_field]
 
     def _split_nested(self, node, context):
         """split the node name to its nesting
@@ -148,16 +152,20 @@ class ElasticsearchQueryBuilder(TreeVisitor):
         # for if eg. author is nested,
         # a direct invocation of author.firstname should be considered nested
         names = node.name.split(".")
-        prefix = self._field_prefix(context)
+        return self._nested_path(".".join(self._field_prefix(context) + names), len(names))
+
+    def _nested_path(self, full_name, depth):
+        """find the nested path of a full field name,
+        reducing it by at most `depth` - 1 parts (those given in the search field)
+        """
+        nested_prefix = full_name
         # we try to reduce the name until we get to a nested field
-        for i in range(len(names)):
-            nested_prefix = ".".join(prefix + names[:-i or None])
+        for _ in range(depth):
             if nested_prefix in self._nested_prefixes:
-                break
-        else:
-            # no nesting at this level
-            nested_prefix = None
-        return nested_prefix
+                return nested_prefix
+            nested_prefix = nested_prefix.rpartition(".")[0]
+        # no nesting at this level
+        return None
 
     def _is_analyzed(self, context):
         """return if current search field is analyzed
@@ -184,12 +192,29 @@ class ElasticsearchQueryBuilder(TreeVisitor):
         :param current_node:
         :return:
         """
-        for child in children:
-            if type(child) is type(current_node):
-                yield from self.simplify_if_same(child.children, current_node)
+        # walk with an explicit stack rather than recursive generators,
+        # as deep chains of same operations would otherwise stack generators
+        same_type = type(current_node)
+        stack = list(reversed(list(children)))
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            child = pop()
+            if type(child) is same_type:
+                extend(reversed(child.children))
             else:
                 yield child
 
+    def _simplified_children(self, node):
+        """children of node, passed through :py:meth:`simplify_if_same`
+        only if one of them is of the same type
+        """
+        children = node.children
+        node_type = type(node)
+        if any(type(child) is node_type for child in children):
+            children = self.simplify_if_same(children, node)
+        return children
+
     def _get_operator_extract(self, binary_operation, delta=8):
         """
         Return an extract around the operator
@@ -215,6 +240,24 @@ class ElasticsearchQueryBuilder(TreeVisitor):
         end = position + delta
         return node_str[start:end]
 
+    @property
+    def _must_operations(self):
+        """operation types resolving to must,
+        UnknownOperation being one of them depending on default operator
+        """
+        if self.default_operator == self.MUST:
+            return (AndOperation, UnknownOperation)
+        return (AndOperation,)
+
+    @property
+    def _should_operations(self):
+        """operation types resolving to should,
+        UnknownOperation being one of them depending on default operator
+        """
+        if self.default_operator == self.SHOULD:
+            return (OrOperation, UnknownOperation)
+        return (OrOperation,)
+
     def _is_must(self, operation):
         """
         Returns True if the node is a AndOperation or an UnknownOperation when
@@ -228,11 +271,7 @@ class ElasticsearchQueryBuilder(TreeVisitor):
             ... )._is_must(AndOperation(Word('Monty'), Word('Python')))
             True
         """
-        return (
-            isinstance(operation, AndOperation) or
-            isinstance(operation, UnknownOperation) and
-            self.default_operator == ElasticsearchQueryBuilder.MUST
-        )
+        return isinstance(operation, self._must_operations)
 
     def _is_should(self, operation):
         """
@@ -245,11 +284,7 @@ class ElasticsearchQueryBuilder(TreeVisitor):
             ... )._is_should(OrOperation(Word('Monty'), Word('Python')))
             True
         """
-        return (
-            isinstance(operation, OrOperation) or
-            isinstance(operation, UnknownOperation) and
-            self.default_operator == ElasticsearchQueryBuilder.SHOULD
-        )
+        return isinstance(operation, self._should_operations)
 
     def _propagate_name(self, node, child_context):
         """if node has a name, put it in child_context to propagate it
@@ -282,27 +317,33 @@ class ElasticsearchQueryBuilder(TreeVisitor):
                 ...
             luqum.exceptions.OrAndAndOnSameLevel: lo AND py
         """
-
+        # parent kind does not change, so resolve operations conflicting with it once
+        conflicting = self._conflicting_operations(parent)
         for child in children:
-            if (self._is_should(parent) and self._is_must(child) or
-               self._is_must(parent) and self._is_should(child)):
-                raise OrAndAndOnSameLevel(
-                    self._get_operator_extract(child)
-                )
+            if isinstance(child, conflicting):
+                raise OrAndAndOnSameLevel(self._get_operator_extract(child), node=child)
             else:
                 yield child
 
+    def _conflicting_operations(self, parent):
+        """operation types that can't be direct children of parent (an empty tuple if none)
+        """
+        if self._is_should(parent):
+            return self._must_operations
+        elif self._is_must(parent):
+            return self._should_operations
+        else:
+            return ()
+
     def _binary_operation(self, cls, node, context):
-        children = self.simplify_if_same(node.children, node)
-        children = self._yield_nested_children(node, children)
-        visit_iter = super().visit_iter  # can't use super inside the comprehension expression
+        children = self._yield_nested_children(node, self._simplified_children(node))
         child_context = dict(context)
         self._propagate_name(node, child_context)
-        items = [
-            item
-            for child in children
-            for item in visit_iter(child, child_context)
-        ]
+        visit_iter = super().visit_iter
+        items = []
+        extend = items.extend
+        for child in children:
+            extend(visit_iter(child, child_context))
         yield self.es_item_factory.build(cls, items)
 
     def _must_operation(self, *args, **kwargs):
@@ -319,16 +360,18 @@ class ElasticsearchQueryBuilder(TreeVisitor):
 
     def visit_search_field(self, node, context):
         # put prefix (for nested fields) and name of field in context
-        prefix = self._field_prefix(context) + node.name.split(".")
+        names = node.name.split(".")
+        prefix = self._field_prefix(context) + names
         name = ".".join(prefix)
-        child_context = dict(context, parents=context.get("parents", ()) + (node,))
+        child_context = self.child_context(node, node.expr, context)
         child_context[self.CONTEXT_ANALYZE_MARKER] = name not in self._not_analyzed_fields
         child_context[self.CONTEXT_FIELD_PREFIX] = prefix
         self._propagate_name(node, child_context)
         enode, = self.visit_iter(node.expr, child_context)
-        nested_path = self._split_nested(node, context)
-        skip_nesting = isinstance(enode, self.E_NESTED)  # no need to nest a nested
-        if nested_path is not None and not skip_nesting:
+        # full name is already computed, use it to find nesting (same as _split_nested)
+        nested_path = self._nested_path(name, len(names))
+        # no need to nest a nested (only checked for nested fields)
+        if nested_path is not None and not isinstance(enode, self.E_NESTED):
             enode = self.es_item_factory.build(
                 self.E_NESTED, nested_path=nested_path, items=enode,
                 _name=self.get_name(node, context),
@@ -336,8 +379,8 @@ class ElasticsearchQueryBuilder(TreeVisitor):
         yield enode
 
     def visit_not(self, node, context):
-        children = self.simplify_if_same(node.children, node)
-        child_context = dict(context, parents=context.get("parents", ()) + (node,))
+        children = self._simplified_children(node)
+        child_context = self.child_context(node, node.a, context)
         self._propagate_name(node, child_context)
         items = [
             item
@@ -361,24 +404,23 @@ class ElasticsearchQueryBuilder(TreeVisitor):
         else:
             yield from self._must_operation(*args, **kwargs)
 
+    def _visit_and_set(self, node, context, attr, value):
+        """visit node expression, expecting a single item, and set attr to value on it
+        """
+        item, = self.generic_visit(node, context)
+        setattr(item, attr, value)
+        yield item
+
     def visit_boost(self, node, context):
-        eword, = self.generic_visit(node, context)
-        eword.boost = float(node.force)
-        yield eword
+        return self._visit_and_set(node, context, "boost", float(node.force))
 
     def visit_fuzzy(self, node, context):
-        eword, = self.generic_visit(node, context)
-        eword.fuzziness = float(node.degree)
-        yield eword
+        return self._visit_and_set(node, context, "fuzziness", float(node.degree))
 
     def visit_proximity(self, node, context):
-        ephrase, = self.generic_visit(node, context)
-        if self._is_analyzed(context):
-            ephrase.slop = float(node.degree)
-        else:
-            # on a term query the ~ is always fuziness
-            ephrase.fuzziness = float(node.degree)
-        yield ephrase
+        # on a term query the ~ is always fuziness
+        attr = "slop" if self._is_analyzed(context) else "fuzziness"
+        return self._visit_and_set(node, context, attr, float(node.degree))
 
     def generic_visit(self, node, context):
         # propagate name
@@ -421,15 +463,12 @@ class ElasticsearchQueryBuilder(TreeVisitor):
 
     def visit_range(self, node, context):
         kwargs = {
-            'gte' if node.include_low else 'gt': node.low.value,
-            'lte' if node.include_high else 'lt': node.high.value,
+            self.RANGE_LOW_KEY[node.include_low]: node.low.value,
+            self.RANGE_HIGH_KEY[node.include_high]: node.high.value,
+            "_name": self.get_name(node, context),
+            "fields": self._fields(context),
         }
-        yield self.es_item_factory.build(
-            self.E_RANGE,
-            _name=self.get_name(node, context),
-            fields=self._fields(context),
-            **kwargs
-        )
+        yield self.es_item_factory.build(self.E_RANGE, **kwargs)
 
     def __call__(self, tree):
         """Calling the query builder returns
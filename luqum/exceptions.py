@@ -7,8 +7,14 @@ class OrAndAndOnSameLevel(InconsistentQueryException):
     """
     Raised when a OR and a AND are on the same level as we don't know how to
     handle this case
+
+    The offending operation may be given as `node`.
     """
 
+    def __init__(self, *args, node=None):
+        super().__init__(*args)
+        self.node = node
+
 
 class NestedSearchFieldException(InconsistentQueryException):
     """
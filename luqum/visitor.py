@@ -43,10 +43,11 @@ class TreeVisitor:
     _get_method_cache = None
 
     def _get_method(self, node):
-        if self._get_method_cache is None:
-            self._get_method_cache = {}
+        cache = self._get_method_cache
+        if cache is None:
+            cache = self._get_method_cache = {}
         try:
-            meth = self._get_method_cache[type(node)]
+            return cache[type(node)]
         except KeyError:
             for cls in node.__class__.mro():
                 try:
@@ -60,8 +61,8 @@ class TreeVisitor:
                     continue
             else:
                 meth = getattr(self, self.generic_visitor_method_name)
-            self._get_method_cache[type(node)] = meth
-        return meth
+            cache[type(node)] = meth
+            return meth
 
     def visit(self, tree, context=None):
         """Traversal of tree
@@ -86,9 +87,11 @@ class TreeVisitor:
         :param list parents: the list of parents
         :param dict context: a dict of contextual variable for free use
             to track states while traversing the tree (eg. the current field name)
+        :return: an iterator over the values produced by the visit method of node
         """
-        method = self._get_method(node)
-        yield from method(node, context)
+        # directly hand over the visit method iterator,
+        # no need to wrap it in yet another generator
+        return self._get_method(node)(node, context)
 
     def child_context(self, node, child, context, **kwargs):
         """Generate a context for children.
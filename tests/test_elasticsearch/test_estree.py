@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from luqum.elasticsearch.tree import EShould, EWord
+from luqum.elasticsearch.tree import EMust, ENested, EPhrase, ERange, EShould, EWord
 
 
 class TestItems(TestCase):
@@ -18,3 +18,38 @@ class TestItems(TestCase):
                 'minimum_should_match': 2,
             }},
         )
+
+    def test_nested_excludes_same_path_nested_children(self):
+        inner = ENested(
+            nested_path="a", nested_fields=[],
+            items=ENested(nested_path="a", nested_fields=[], items=EPhrase('"x"', fields=["a"])),
+        )
+        other = ENested(
+            nested_path="b", nested_fields=[],
+            items=EShould(items=[
+                ENested(nested_path="a", nested_fields=[], items=EPhrase('"y"', fields=["a"])),
+            ]),
+        )
+        tree = EMust(items=[EShould(items=[inner, EPhrase('"z"', fields=["a"])]), other])
+        nested = ENested(nested_path="a", nested_fields=[], items=tree)
+        self.assertEqual(
+            repr(nested),
+            "ENested(a, EMust(EShould(EPhrase(a=x), EPhrase(a=z)), "
+            "ENested(b, EShould(ENested(a, EPhrase(a=y))))))",
+        )
+
+    def test_items_have_no_dict(self):
+        for item in [EWord(q="a"), EPhrase('"a b"'), ERange(lt=1)]:
+            self.assertFalse(hasattr(item, "__dict__"))
+
+    def test_items_instance_keys(self):
+        phrase = EPhrase('"a b"', fields=["text"])
+        phrase.slop = 2
+        self.assertEqual(phrase.json, {'match_phrase': {'text': {'query': 'a b', 'slop': 2}}})
+        # it does not leak on other instances
+        self.assertEqual(
+            EPhrase('"a b"', fields=["text"]).json,
+            {'match_phrase': {'text': {'query': 'a b'}}},
+        )
+        self.assertEqual(
+            ERange(lt=2, gte=1, fields=["num"]).json, {'range': {'num': {'lt': 2, 'gte': 1}}})
@@ -44,6 +44,47 @@ class ElasticsearchTreeTransformerTestCase(TestCase):
         ]}}
         self.assertDictEqual(result, expected)
 
+    def test_override_operation_methods(self):
+        called = []
+
+        class CustomQueryBuilder(ElasticsearchQueryBuilder):
+            def _must_operation(self, *args, **kwargs):
+                called.append("must")
+                yield from super()._must_operation(*args, **kwargs)
+
+            def _should_operation(self, *args, **kwargs):
+                called.append("should")
+                yield from super()._should_operation(*args, **kwargs)
+
+            def visit_not(self, *args, **kwargs):
+                called.append("not")
+                yield from super().visit_not(*args, **kwargs)
+
+        transformer = CustomQueryBuilder()
+        transformer(AndOperation(Word('spam'), Word('eggs')))
+        transformer(OrOperation(Word('spam'), Word('eggs')))
+        transformer(Plus(Word('spam')))
+        transformer(Prohibit(Word('spam')))
+        self.assertEqual(called, ["must", "should", "must", "not"])
+
+    def test_parents_tracking(self):
+        seen_parents = []
+
+        class ParentsQueryBuilder(ElasticsearchQueryBuilder):
+            def visit_word(self, node, context):
+                seen_parents.append(context.get("parents"))
+                yield from super().visit_word(node, context)
+
+        tree = SearchField("spam", Group(Word("eggs")))
+        transformer = ParentsQueryBuilder()
+        transformer(tree)
+        # parents are not tracked by default
+        self.assertEqual(seen_parents, [None])
+        # but may be switched on
+        transformer.track_parents = True
+        transformer(tree)
+        self.assertEqual(seen_parents[1], (tree, tree.expr))
+
     def test_should_raise_when_nested_search_field(self):
         # Note that there are more extensive tests on the checker itself
         # so we do not use so much test cases here,
@@ -123,6 +164,37 @@ class ElasticsearchTreeTransformerTestCase(TestCase):
         with self.assertRaises(OrAndAndOnSameLevel):
             self.transformer(tree)
 
+    def test_or_and_and_on_same_level_message(self):
+        tree = parser.parse('spam OR (ham AND eggs OR monty python)')
+        with self.assertRaises(OrAndAndOnSameLevel) as raised:
+            self.transformer(tree)
+        self.assertEqual(str(raised.exception), "ham AND eggs ")
+        self.assertEqual(raised.exception.node, AndOperation(Word('ham'), Word('eggs')))
+        self.assertEqual(raised.exception.args, ("ham AND eggs ",))
+        tree = parser.parse('ham eggs OR monty')
+        with self.assertRaises(OrAndAndOnSameLevel) as raised:
+            ElasticsearchQueryBuilder(default_operator=ElasticsearchQueryBuilder.MUST)(tree)
+        self.assertEqual(str(raised.exception), "eggs OR monty")
+
+    def test_is_must_is_should(self):
+        unknown = UnknownOperation(Word('spam'), Word('eggs'))
+        must_builder = ElasticsearchQueryBuilder(
+            default_operator=ElasticsearchQueryBuilder.MUST)
+        self.assertTrue(must_builder._is_must(unknown))
+        self.assertFalse(must_builder._is_should(unknown))
+        self.assertTrue(self.transformer._is_should(unknown))
+        self.assertFalse(self.transformer._is_must(unknown))
+        # default operator is read at call time
+        must_builder.default_operator = ElasticsearchQueryBuilder.SHOULD
+        self.assertTrue(must_builder._is_should(unknown))
+        self.assertFalse(must_builder._is_must(unknown))
+        # bool operation accepts any children
+        op = BoolOperation(Word('spam'), AndOperation(Word('eggs'), Word('monty')), unknown)
+        self.assertEqual(
+            list(self.transformer._yield_nested_children(op, op.children)),
+            list(op.children),
+        )
+
     def test_should_raise_when_or_and_and_on_same_level2(self):
         tree = UnknownOperation(
             Word('spam'),
@@ -306,6 +378,13 @@ class ElasticsearchTreeTransformerTestCase(TestCase):
         ]}}
         self.assertDictEqual(result, expected)
 
+    def test_unknown_operation_follows_default_operator(self):
+        transformer = ElasticsearchQueryBuilder()
+        tree = UnknownOperation(Word('spam'), Word('eggs'))
+        self.assertIn('should', transformer(tree)['bool'])
+        transformer.default_operator = ElasticsearchQueryBuilder.MUST
+        self.assertIn('must', transformer(tree)['bool'])
+
     def test_should_simplify_nested_and(self):
         tree = AndOperation(
             Word("spam"),
@@ -346,6 +425,28 @@ class ElasticsearchTreeTransformerTestCase(TestCase):
         ]}}
         self.assertDictEqual(result, expected)
 
+    def test_should_simplify_left_nested_and_keeping_order(self):
+        tree = AndOperation(
+            AndOperation(
+                AndOperation(Word("spam"), Word("eggs")),
+                Word("monthy"),
+            ),
+            Word("python"),
+        )
+        result = self.transformer(tree)
+        expected = {'bool': {'must': [
+            {"term": {"text": {"value": 'spam'}}},
+            {"term": {"text": {"value": 'eggs'}}},
+            {"term": {"text": {"value": 'monthy'}}},
+            {"term": {"text": {"value": 'python'}}},
+        ]}}
+        self.assertDictEqual(result, expected)
+
+    def test_simplify_if_same_accepts_iterable(self):
+        tree = AndOperation(AndOperation(Word("spam"), Word("eggs")), Word("monthy"))
+        children = self.transformer.simplify_if_same(iter(tree.children), tree)
+        self.assertEqual(list(children), [Word("spam"), Word("eggs"), Word("monthy")])
+
     def test_should_not_simplify_nested_or_in_and(self):
         tree = AndOperation(
             Word("spam"),
@@ -987,6 +1088,15 @@ class NestedAndObjectFieldsTestCase(TestCase):
         }}
         self.assertDictEqual(result, expected)
 
+    def test_split_nested(self):
+        split_nested = self.transformer._split_nested
+        prefix = ElasticsearchQueryBuilder.CONTEXT_FIELD_PREFIX
+        self.assertEqual(split_nested(SearchField("author", Word("x")), {}), "author")
+        self.assertEqual(split_nested(SearchField("author.name", Word("x")), {}), "author")
+        self.assertEqual(
+            split_nested(SearchField("name", Word("x")), {prefix: ["author"]}), None)
+        self.assertEqual(split_nested(SearchField("book.title", Word("x")), {}), None)
+
     def test_query_nested_field_with_column(self):
         """
         Can query a nested field using column
@@ -89,6 +89,18 @@ class TreeVisitorTestCase(TestCase):
         result = visitor.visit(tree)
         self.assertEqual(list(result), ['a BASE_OP b', 'a', 'b'])
 
+    def test_visit_iter_returns_method_iterator(self):
+        values = iter(["foo"])
+
+        class ReturningVisitor(TreeVisitor):
+            def visit_word(self, node, context):
+                return values
+
+        # the visit method iterator is handed over, not wrapped in another generator
+        visitor = ReturningVisitor()
+        self.assertIs(visitor.visit_iter(Word("a"), {}), values)
+        self.assertEqual(list(visitor.visit_iter(Word("b"), {})), ["foo"])
+
 
 class TreeTransformerTestCase(TestCase):
 